@@ -0,0 +1,125 @@
+"""Compiled pairwise separation check used by ``detect_conflicts``."""
+from __future__ import annotations
+
+import numpy as np
+
+from ._numba import njit, prange
+from ._trajectory_kernel import EARTH_RADIUS_NM, _haversine_precomputed
+
+# Equirectangular distance is within a fraction of a percent of the great
+# circle at these ranges; the slack keeps the gate from rejecting a true hit.
+GATE_SLACK = 1.01
+
+
+@njit(fastmath=True, cache=True)
+def _within_gate(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2, gate_rad2):
+    """Whether the pair may be close enough to be worth the haversine.
+
+    The cheap equirectangular estimate is compared squared against
+    ``gate_rad2``. Returning a flag rather than an ``inf`` distance keeps
+    the reject path finite, which ``fastmath`` requires.
+    """
+    dphi = phi1 - phi2
+    dlam = (lam1 - lam2) * 0.5 * (cos_phi1 + cos_phi2)
+    return dphi * dphi + dlam * dlam < gate_rad2
+
+
+@njit(fastmath=True, cache=True)
+def _try_pair(i, j, phi, lam, cos_phi, alt, acid_id, h_limit, v_limit, gate_rad2, slot, out_i, out_j, out_h, out_v, write):
+    """Test one pair and write it at ``slot`` when it is a hit; returns 1 on a hit."""
+    if acid_id[i] == acid_id[j]:
+        return 0
+    vertical = abs(alt[i] - alt[j])
+    if vertical >= v_limit:
+        return 0
+    if not _within_gate(phi[i], lam[i], cos_phi[i], phi[j], lam[j], cos_phi[j], gate_rad2):
+        return 0
+    horizontal = _haversine_precomputed(phi[i], lam[i], cos_phi[i], phi[j], lam[j], cos_phi[j])
+    if horizontal >= h_limit:
+        return 0
+    if write:
+        out_i[slot] = min(i, j)
+        out_j[slot] = max(i, j)
+        out_h[slot] = horizontal
+        out_v[slot] = vertical
+    return 1
+
+
+@njit(fastmath=True, cache=True)
+def _scan_bin(
+    lo, hi, phi, lam, cos_phi, alt, acid_id, bucket, forward_offsets, brute_force_max,
+    h_limit, v_limit, offset, out_i, out_j, out_h, out_v, write,
+):
+    gate = h_limit * GATE_SLACK / EARTH_RADIUS_NM
+    gate_rad2 = gate * gate
+    found = 0
+
+    if hi - lo < brute_force_max:
+        for i in range(lo, hi):
+            for j in range(i + 1, hi):
+                found += _try_pair(
+                    i, j, phi, lam, cos_phi, alt, acid_id, h_limit, v_limit, gate_rad2,
+                    offset + found, out_i, out_j, out_h, out_v, write,
+                )
+        return found
+
+    # Bucket sweep: sort the bin by packed bucket key and, for each point,
+    # walk the runs of its own bucket (later points only) and of the
+    # forward half of its neighbourhood.
+    order = np.argsort(bucket[lo:hi], kind="mergesort") + lo
+    keys = bucket[order]
+    count = hi - lo
+    for a in range(count):
+        for offset_index in range(len(forward_offsets)):
+            target = keys[a] + forward_offsets[offset_index]
+            b = a + 1 if forward_offsets[offset_index] == 0 else np.searchsorted(keys, target)
+            while b < count and keys[b] == target:
+                found += _try_pair(
+                    order[a], order[b], phi, lam, cos_phi, alt, acid_id, h_limit, v_limit, gate_rad2,
+                    offset + found, out_i, out_j, out_h, out_v, write,
+                )
+                b += 1
+    return found
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def detect_pairs(
+    phi, lam, cos_phi, alt, acid_id, bucket, bin_bounds, forward_offsets, brute_force_max, h_limit, v_limit
+):
+    """Return ``(i, j, horizontal_nm, vertical_ft)`` for every close pair, with ``i < j``.
+
+    Positions come in as radians with a precomputed ``cos(phi)`` per point
+    so no trig is repeated per pair. Points must be grouped by time bin;
+    ``bin_bounds`` holds the start offset of each bin plus a final end
+    offset. Bins smaller than ``brute_force_max`` compare every pair;
+    larger ones only compare points whose packed ``bucket`` keys differ
+    by one of ``forward_offsets``. Pairs are grouped by bin but not
+    ordered within it.
+    """
+    n_bins = len(bin_bounds) - 1
+    empty_i = np.empty(0, dtype=np.int64)
+    empty_h = np.empty(0, dtype=np.float64)
+
+    counts = np.zeros(n_bins, dtype=np.int64)
+    for b in prange(n_bins):
+        counts[b] = _scan_bin(
+            bin_bounds[b], bin_bounds[b + 1], phi, lam, cos_phi, alt, acid_id, bucket, forward_offsets,
+            brute_force_max, h_limit, v_limit, 0, empty_i, empty_i, empty_h, empty_i, False,
+        )
+
+    offsets = np.zeros(n_bins + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    total = offsets[n_bins]
+    out_i = np.empty(total, dtype=np.int64)
+    out_j = np.empty(total, dtype=np.int64)
+    out_h = np.empty(total, dtype=np.float64)
+    out_v = np.empty(total, dtype=np.int64)
+
+    for b in prange(n_bins):
+        if counts[b]:
+            _scan_bin(
+                bin_bounds[b], bin_bounds[b + 1], phi, lam, cos_phi, alt, acid_id, bucket, forward_offsets,
+                brute_force_max, h_limit, v_limit, offsets[b], out_i, out_j, out_h, out_v, True,
+            )
+
+    return out_i, out_j, out_h, out_v
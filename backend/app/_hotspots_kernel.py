@@ -0,0 +1,66 @@
+"""Compiled cell aggregation used by ``detect_hotspots``."""
+from __future__ import annotations
+
+import numpy as np
+
+from ._numba import NUMBA_AVAILABLE, njit
+
+if NUMBA_AVAILABLE:
+    from numba import types
+    from numba.typed import Dict
+
+
+@njit(cache=True)
+def hotspots_core(cell, key, time_bin, acid_id, n_acids):
+    """Per-cell occupancy stats, one row per cell in first-seen order.
+
+    ``cell`` is the packed (lat, lon, altitude) bucket of each point and
+    ``key`` the packed (cell, time bin). Returns ``(first_point,
+    peak_density, occupied_bins, unique_flights, first_bin, last_bin)``.
+    """
+    count = len(cell)
+    slots = Dict.empty(key_type=types.int64, value_type=types.int64)
+    occupancy = Dict.empty(key_type=types.int64, value_type=types.int64)
+    flights_seen = Dict.empty(key_type=types.int64, value_type=types.int64)
+
+    first_point = np.empty(count, dtype=np.int64)
+    peak_density = np.zeros(count, dtype=np.int64)
+    occupied_bins = np.zeros(count, dtype=np.int64)
+    unique_flights = np.zeros(count, dtype=np.int64)
+    first_bin = np.empty(count, dtype=np.int64)
+    last_bin = np.empty(count, dtype=np.int64)
+
+    n_cells = 0
+    for p in range(count):
+        if cell[p] in slots:
+            slot = slots[cell[p]]
+        else:
+            slot = n_cells
+            slots[cell[p]] = slot
+            first_point[slot] = p
+            first_bin[slot] = time_bin[p]
+            last_bin[slot] = time_bin[p]
+            n_cells += 1
+
+        density = occupancy[key[p]] + 1 if key[p] in occupancy else 1
+        occupancy[key[p]] = density
+        if density == 1:
+            occupied_bins[slot] += 1
+            first_bin[slot] = min(first_bin[slot], time_bin[p])
+            last_bin[slot] = max(last_bin[slot], time_bin[p])
+        if density > peak_density[slot]:
+            peak_density[slot] = density
+
+        flight_key = cell[p] * n_acids + acid_id[p]
+        if flight_key not in flights_seen:
+            flights_seen[flight_key] = 1
+            unique_flights[slot] += 1
+
+    return (
+        first_point[:n_cells],
+        peak_density[:n_cells],
+        occupied_bins[:n_cells],
+        unique_flights[:n_cells],
+        first_bin[:n_cells],
+        last_bin[:n_cells],
+    )
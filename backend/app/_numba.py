@@ -0,0 +1,25 @@
+"""Optional Numba support.
+
+Kernels are decorated with ``njit`` unconditionally; when Numba is not
+installed the decorator is a no-op and callers should check
+``NUMBA_AVAILABLE`` to pick their NumPy path instead.
+"""
+from __future__ import annotations
+
+try:
+    from numba import config as _config, njit, prange
+
+    # Parallel kernels are launched from the API's worker threads. The TBB
+    # layer blocks interpreter exit after such launches and the workqueue
+    # layer is not thread-safe, so prefer OpenMP when it is available.
+    _config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -0,0 +1,93 @@
+"""Compiled sampling loop used by ``build_trajectory``."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from ._numba import njit
+
+# Lives here so the kernels can use it; trajectory.py re-exports it.
+EARTH_RADIUS_NM = 3440.065
+
+
+@njit(fastmath=False, cache=True)
+def _haversine_precomputed(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2):
+    """Great-circle distance in NM from per-point radians and cos(latitude).
+
+    The one compiled haversine; same formula as ``great_circle_nm``.
+    ``fastmath`` is switched off explicitly: Numba otherwise compiles a
+    callee with its caller's flags, and the conflict kernel's fastmath
+    build would then be what ``segment_distances`` gets too, breaking
+    the bit-for-bit match with the scalar and NumPy paths.
+    """
+    sin_dphi = math.sin((phi2 - phi1) / 2.0)
+    sin_dlam = math.sin((lam2 - lam1) / 2.0)
+    h = sin_dphi * sin_dphi + cos_phi1 * cos_phi2 * sin_dlam * sin_dlam
+    return 2.0 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(h)))
+
+
+@njit(cache=True)
+def segment_distances(coords):
+    """Great-circle length of each leg of a route."""
+    n_segments = max(len(coords) - 1, 0)
+    distances = np.empty(n_segments, dtype=np.float64)
+    if n_segments == 0:
+        return distances
+    phi1, lam1 = math.radians(coords[0, 0]), math.radians(coords[0, 1])
+    cos_phi1 = math.cos(phi1)
+    for k in range(n_segments):
+        phi2, lam2 = math.radians(coords[k + 1, 0]), math.radians(coords[k + 1, 1])
+        cos_phi2 = math.cos(phi2)
+        distances[k] = _haversine_precomputed(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2)
+        phi1, lam1, cos_phi1 = phi2, lam2, cos_phi2
+    return distances
+
+
+@njit(cache=True)
+def trajectory_core(coords, distances, speed_kt, sample_sec, total_sec):
+    """Sampled (lat, lon) positions along a route, one per ``sample_sec``.
+
+    Progress restarts at zero on each new segment, dropping the overshoot
+    of the tick that finished the previous one; ``_sample_positions``
+    reproduces this exactly with NumPy. Zero-length segments never hold a
+    sample, so they are dropped up front and finishing a segment is a
+    single step to the next leg.
+    """
+    n_segments = len(distances)
+    n_samples = total_sec // sample_sec + 1
+    lat = np.empty(n_samples, dtype=np.float64)
+    lon = np.empty(n_samples, dtype=np.float64)
+
+    legs = np.flatnonzero(~(distances <= 0))
+    n_legs = len(legs)
+
+    advance_nm = speed_kt * sample_sec / 3600.0
+    leg = 0
+    segment_index = legs[0] if n_legs else n_segments
+    segment_progress = 0.0
+    segment_remaining = distances[segment_index] if n_legs else 0.0
+    segment_len = max(1e-6, segment_remaining)
+
+    for sample in range(n_samples):
+        if leg < n_legs and segment_remaining <= 0:
+            leg += 1
+            if leg < n_legs:
+                segment_index = legs[leg]
+                segment_remaining = distances[segment_index]
+                segment_len = max(1e-6, segment_remaining)
+                segment_progress = 0.0
+
+        if leg >= n_legs:
+            lat[sample] = coords[n_segments, 0]
+            lon[sample] = coords[n_segments, 1]
+        else:
+            t = min(1.0, segment_progress / segment_len)
+            lat_a, lon_a = coords[segment_index, 0], coords[segment_index, 1]
+            lat[sample] = lat_a + (coords[segment_index + 1, 0] - lat_a) * t
+            lon[sample] = lon_a + (coords[segment_index + 1, 1] - lon_a) * t
+
+        segment_progress += advance_nm
+        segment_remaining -= advance_nm
+
+    return lat, lon
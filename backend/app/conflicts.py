@@ -1,24 +1,89 @@
 from __future__ import annotations
 
-import math
 from collections import defaultdict
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
+
+from ._conflict_kernel import GATE_SLACK, detect_pairs
+from ._numba import NUMBA_AVAILABLE
 from .models import ConflictEvent, TrajectoryPoint
-from .trajectory import great_circle_nm
+from .trajectory import EARTH_RADIUS_NM, TrajBuffer, _haversine_nm, flatten_trajectories
 
 HORIZONTAL_THRESHOLD_NM = 5.0
 VERTICAL_THRESHOLD_FT = 2000
 
+# Bins with fewer points than this compare every pair instead of bucketing.
+BRUTE_FORCE_MAX_POINTS = 32
+TARGET_POINTS_PER_BUCKET = 4
+
+
+def _bucket_key(lat: np.ndarray, lon: np.ndarray, bucket_deg: float | np.ndarray) -> np.ndarray:
+    """Packed spatial bucket ``lat_b * 2**32 + lon_b`` as one int64 per point."""
+    lat_b = np.floor(lat / bucket_deg).astype(np.int64)
+    lon_b = np.floor(lon / bucket_deg).astype(np.int64)
+    return (lat_b << 32) + lon_b
+
+
+# Key deltas to a bucket itself and the forward half of its 3x3
+# neighbourhood under _bucket_key packing: (0, 0), (0, 1), (1, -1), (1, 0), (1, 1).
+_FORWARD_OFFSETS = np.array([0, 1, (1 << 32) - 1, 1 << 32, (1 << 32) + 1], dtype=np.int64)
+
+
+def _adaptive_bucket_deg(
+    lat_min: np.ndarray, lat_max: np.ndarray, lon_min: np.ndarray, lon_max: np.ndarray,
+    count: np.ndarray, bucket_deg: float,
+) -> np.ndarray:
+    """Bucket size aiming at ~TARGET_POINTS_PER_BUCKET points per bucket.
+
+    Capped at ``bucket_deg`` but never narrower than the horizontal
+    threshold in longitude at the bin's highest latitude, so two points
+    within the threshold always land in the same or adjacent buckets.
+    That floor takes precedence: near the poles (about |lat| > 85 degrees
+    with the default 1 degree) it exceeds ``bucket_deg`` and wins.
+    """
+    max_abs_lat = np.minimum(np.maximum(np.abs(lat_min), np.abs(lat_max)), 89.0)
+    min_deg = HORIZONTAL_THRESHOLD_NM * 1.05 / 60.0 / np.cos(np.radians(max_abs_lat))
+    area = np.maximum((lat_max - lat_min) * (lon_max - lon_min), 1e-9)
+    ideal = np.sqrt(area * TARGET_POINTS_PER_BUCKET / count)
+    return np.maximum(np.minimum(ideal, bucket_deg), min_deg)
 
-def _bucket_key(lat: float, lon: float, bucket_deg: float) -> Tuple[int, int]:
-    return (int(math.floor(lat / bucket_deg)), int(math.floor(lon / bucket_deg)))
 
+def _candidate_pairs(bucket: np.ndarray, acid_id: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index pairs (i < j), sorted, of different flights in the same or adjacent buckets."""
+    order = np.argsort(bucket, kind="stable")
+    keys = bucket[order]
+    positions = np.arange(len(keys))
 
-def _neighbor_keys(key: Tuple[int, int]) -> Iterable[Tuple[int, int]]:
-    for dlat in (-1, 0, 1):
-        for dlon in (-1, 0, 1):
-            yield (key[0] + dlat, key[1] + dlon)
+    firsts: List[np.ndarray] = []
+    seconds: List[np.ndarray] = []
+    for offset in _FORWARD_OFFSETS.tolist():
+        stop = np.searchsorted(keys, keys + offset, side="right")
+        start = positions + 1 if offset == 0 else np.searchsorted(keys, keys + offset, side="left")
+        run = np.maximum(stop - start, 0)
+        first = np.repeat(positions, run)
+        second = np.arange(run.sum()) - np.repeat(np.cumsum(run) - run, run) + np.repeat(start, run)
+        firsts.append(order[first])
+        seconds.append(order[second])
+
+    i, j = np.concatenate(firsts), np.concatenate(seconds)
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    keep = acid_id[i] != acid_id[j]
+    i, j = i[keep], j[keep]
+    by_pair = np.lexsort((j, i))
+    return i[by_pair], j[by_pair]
+
+
+def _equirect_close(
+    phi1: np.ndarray, lam1: np.ndarray, cos_phi1: np.ndarray,
+    phi2: np.ndarray, lam2: np.ndarray, cos_phi2: np.ndarray,
+    limit_nm: float,
+) -> np.ndarray:
+    """Cheap pre-filter: True where the pair may be within ``limit_nm``."""
+    dphi = phi1 - phi2
+    dlam = (lam1 - lam2) * 0.5 * (cos_phi1 + cos_phi2)
+    gate = limit_nm * GATE_SLACK / EARTH_RADIUS_NM
+    return dphi * dphi + dlam * dlam < gate * gate
 
 
 def _severity(horizontal_nm: float, vertical_ft: int) -> float:
@@ -27,48 +92,149 @@ def _severity(horizontal_nm: float, vertical_ft: int) -> float:
     return round(horiz + vert, 4)
 
 
+def _record_hits(
+    raw_hits: Dict[int, List[Tuple[int, float, int]]],
+    acid_id: np.ndarray,
+    timestamp: np.ndarray,
+    i: np.ndarray,
+    j: np.ndarray,
+    horizontal_nm: np.ndarray,
+    vertical_ft: np.ndarray,
+) -> None:
+    id_a, id_b = acid_id[i], acid_id[j]
+    pair_keys = np.where(id_a < id_b, (id_a << 32) | id_b, (id_b << 32) | id_a)
+    ts_a, ts_b = timestamp[i], timestamp[j]
+
+    # Each side of the pair records the hit at its own sample time. Emitting
+    # the records in time order keeps every pair's hit list sorted, as long
+    # as callers pass bins in ascending order.
+    second = ts_b != ts_a
+    keys = np.concatenate((pair_keys, pair_keys[second]))
+    times = np.concatenate((ts_a, ts_b[second]))
+    horiz = np.concatenate((horizontal_nm, horizontal_nm[second]))
+    vert = np.concatenate((vertical_ft, vertical_ft[second]))
+    by_time = np.argsort(times, kind="stable")
+    for pair_key, hit in zip(
+        keys[by_time].tolist(), zip(times[by_time].tolist(), horiz[by_time].tolist(), vert[by_time].tolist())
+    ):
+        raw_hits[pair_key].append(hit)
+
+
+def _time_bins(ts: np.ndarray, time_bin_sec: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group point indices by time bin without a per-point Python loop.
+
+    Bin ``k`` holds ``order[bounds[k]:bounds[k + 1]]``. Bins come in
+    ascending time and keep their points in buffer order.
+    """
+    if not len(ts):
+        return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    bin_ids = ts // time_bin_sec
+    order = np.argsort(bin_ids, kind="stable")
+    sorted_ids = bin_ids[order]
+    bounds = np.concatenate(([0], np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1, [len(order)]))
+    return order, bounds
+
+
+def _numpy_hits(
+    buffer: TrajBuffer,
+    order: np.ndarray,
+    bounds: np.ndarray,
+    bucket_deg: float,
+    raw_hits: Dict[int, List[Tuple[int, float, int]]],
+) -> None:
+    for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        count = stop - start
+        if count < 2:
+            continue
+
+        members = order[start:stop]
+        lat, lon, alt = buffer.lat[members], buffer.lon[members], buffer.alt[members]
+        ts, acid_id = buffer.ts[members], buffer.acid_id[members]
+
+        if count < BRUTE_FORCE_MAX_POINTS:
+            i, j = np.triu_indices(count, k=1)
+            distinct = acid_id[i] != acid_id[j]
+            i, j = i[distinct], j[distinct]
+        else:
+            bin_deg = _adaptive_bucket_deg(lat.min(), lat.max(), lon.min(), lon.max(), count, bucket_deg)
+            i, j = _candidate_pairs(_bucket_key(lat, lon, bin_deg), acid_id)
+        if not len(i):
+            continue
+
+        phi, lam = np.radians(lat), np.radians(lon)
+        cos_phi = np.cos(phi)
+        vertical_ft = np.abs(alt[i] - alt[j])
+        near = (vertical_ft < VERTICAL_THRESHOLD_FT) & _equirect_close(
+            phi[i], lam[i], cos_phi[i], phi[j], lam[j], cos_phi[j], HORIZONTAL_THRESHOLD_NM
+        )
+        i, j, vertical_ft = i[near], j[near], vertical_ft[near]
+
+        horizontal_nm = _haversine_nm(phi[i], lam[i], cos_phi[i], phi[j], lam[j], cos_phi[j])
+        hit = horizontal_nm < HORIZONTAL_THRESHOLD_NM
+        _record_hits(raw_hits, acid_id, ts, i[hit], j[hit], horizontal_nm[hit], vertical_ft[hit])
+
+
+def _kernel_hits(
+    buffer: TrajBuffer,
+    order: np.ndarray,
+    bin_bounds: np.ndarray,
+    bucket_deg: float,
+    raw_hits: Dict[int, List[Tuple[int, float, int]]],
+) -> None:
+    if len(order) < 2:
+        return
+
+    lat, lon, alt = buffer.lat[order], buffer.lon[order], buffer.alt[order]
+    ts, acid_id = buffer.ts[order], buffer.acid_id[order]
+    bin_sizes = np.diff(bin_bounds)
+    bin_starts = bin_bounds[:-1]
+    bin_deg = _adaptive_bucket_deg(
+        np.minimum.reduceat(lat, bin_starts),
+        np.maximum.reduceat(lat, bin_starts),
+        np.minimum.reduceat(lon, bin_starts),
+        np.maximum.reduceat(lon, bin_starts),
+        bin_sizes,
+        bucket_deg,
+    )
+    bucket = _bucket_key(lat, lon, np.repeat(bin_deg, bin_sizes))
+    phi, lam = np.radians(lat), np.radians(lon)
+    i, j, horizontal_nm, vertical_ft = detect_pairs(
+        phi, lam, np.cos(phi), alt, acid_id, bucket, bin_bounds, _FORWARD_OFFSETS, BRUTE_FORCE_MAX_POINTS,
+        HORIZONTAL_THRESHOLD_NM, VERTICAL_THRESHOLD_FT,
+    )
+    # The kernel groups hits by bin but not within one; restore (i, j) order
+    # so conflicts come out in the same order as the NumPy path.
+    by_pair = np.lexsort((j, i))
+    i, j, horizontal_nm, vertical_ft = i[by_pair], j[by_pair], horizontal_nm[by_pair], vertical_ft[by_pair]
+    _record_hits(raw_hits, acid_id, ts, i, j, horizontal_nm, vertical_ft)
+
+
 def detect_conflicts(
-    trajectories: Dict[str, List[TrajectoryPoint]],
+    trajectories: Union[Dict[str, List[TrajectoryPoint]], TrajBuffer],
     time_bin_sec: int = 60,
     bucket_deg: float = 1.0,
 ) -> List[ConflictEvent]:
-    bins: Dict[int, List[TrajectoryPoint]] = defaultdict(list)
-    for points in trajectories.values():
-        for point in points:
-            bin_key = int(point.timestamp // time_bin_sec)
-            bins[bin_key].append(point)
-
-    raw_hits: Dict[Tuple[str, str], List[Tuple[int, float, int]]] = defaultdict(list)
-
-    for bin_key, points in bins.items():
-        spatial: Dict[Tuple[int, int], List[TrajectoryPoint]] = defaultdict(list)
-        for point in points:
-            spatial[_bucket_key(point.lat, point.lon, bucket_deg)].append(point)
-
-        checked_pairs = set()
-        for bucket, bucket_points in spatial.items():
-            candidates: List[TrajectoryPoint] = []
-            for neighbor in _neighbor_keys(bucket):
-                candidates.extend(spatial.get(neighbor, []))
-
-            for i, point_a in enumerate(bucket_points):
-                for point_b in candidates:
-                    if point_a.acid == point_b.acid:
-                        continue
-                    pair = tuple(sorted((point_a.acid, point_b.acid)))
-                    pair_key = (pair, point_a.timestamp)
-                    if pair_key in checked_pairs:
-                        continue
-                    checked_pairs.add(pair_key)
-
-                    horizontal_nm = great_circle_nm((point_a.lat, point_a.lon), (point_b.lat, point_b.lon))
-                    vertical_ft = abs(point_a.altitude_ft - point_b.altitude_ft)
-                    if horizontal_nm < HORIZONTAL_THRESHOLD_NM and vertical_ft < VERTICAL_THRESHOLD_FT:
-                        raw_hits[pair].append((point_a.timestamp, horizontal_nm, vertical_ft))
+    if isinstance(trajectories, TrajBuffer):
+        buffer = trajectories
+    else:
+        buffer = flatten_trajectories(trajectories)
+
+    order, bounds = _time_bins(buffer.ts, time_bin_sec)
+
+    # Flight ids follow name order, so a pair packs into a single int key
+    # whose high half is always the alphabetically first flight.
+    acid_names = buffer.acid_names
+
+    raw_hits: Dict[int, List[Tuple[int, float, int]]] = defaultdict(list)
+    if NUMBA_AVAILABLE:
+        _kernel_hits(buffer, order, bounds, bucket_deg, raw_hits)
+    else:
+        _numpy_hits(buffer, order, bounds, bucket_deg, raw_hits)
 
     conflicts: List[ConflictEvent] = []
-    for pair, hits in raw_hits.items():
-        hits.sort(key=lambda h: h[0])
+    for pair_key, hits in raw_hits.items():
+        flight_a, flight_b = acid_names[pair_key >> 32], acid_names[pair_key & 0xFFFFFFFF]
         start = hits[0][0]
         end = hits[0][0]
         min_h = hits[0][1]
@@ -82,8 +248,8 @@ def detect_conflicts(
             else:
                 conflicts.append(
                     ConflictEvent(
-                        flight_a=pair[0],
-                        flight_b=pair[1],
+                        flight_a=flight_a,
+                        flight_b=flight_b,
                         start_time=start,
                         end_time=end + time_bin_sec,
                         min_horizontal_nm=round(min_h, 4),
@@ -98,8 +264,8 @@ def detect_conflicts(
 
         conflicts.append(
             ConflictEvent(
-                flight_a=pair[0],
-                flight_b=pair[1],
+                flight_a=flight_a,
+                flight_b=flight_b,
                 start_time=start,
                 end_time=end + time_bin_sec,
                 min_horizontal_nm=round(min_h, 4),
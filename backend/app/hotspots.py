@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import math
-from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
+
+from ._hotspots_kernel import hotspots_core
+from ._numba import NUMBA_AVAILABLE
 from .models import HotspotCell, TrajectoryPoint
+from .trajectory import TrajBuffer, flatten_trajectories
 
 
 @dataclass(frozen=True)
@@ -17,71 +20,105 @@ class HotspotConfig:
     top_n: int = 10
 
 
-def _bucket(value: float, step: float) -> int:
-    return int(math.floor(value / step))
+def _bucket(values: np.ndarray, step: float) -> np.ndarray:
+    return np.floor(values / step).astype(np.int64)
+
+
+def _pack(columns: List[np.ndarray]) -> np.ndarray:
+    """Pack integer columns into one int64 key that sorts lexicographically.
+
+    Each column is rebased to its minimum and folded in mixed-radix, so
+    the key fits as long as the product of the column spans does.
+    """
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    capacity = 1
+    for column in columns:
+        low = int(column.min())
+        span = int(column.max()) - low + 1
+        capacity *= span
+        if capacity >= 2**63:
+            raise ValueError("hotspot grid too large to index")
+        key = key * span + (column - low)
+    return key
+
+
+def _run_starts(sorted_keys: np.ndarray) -> np.ndarray:
+    """Start offsets of each run of equal values in a sorted array."""
+    return np.concatenate(([0], np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1))
+
+
+def _cell_stats(
+    cell: np.ndarray, key: np.ndarray, time_bin: np.ndarray, acid_id: np.ndarray, n_acids: int
+) -> Tuple[np.ndarray, ...]:
+    """NumPy counterpart of ``hotspots_core`` with the same outputs and cell order."""
+    # Sorting the packed (cell, time bin) keys makes every cell's time bins
+    # contiguous so the per-cell stats reduce with reduceat.
+    order = np.argsort(key, kind="stable")
+    bin_starts = _run_starts(key[order])
+    density = np.diff(np.append(bin_starts, len(key)))
+    occupied = order[bin_starts]
+
+    starts = _run_starts(cell[occupied])
+    ends = np.append(starts[1:], len(occupied))
+    _, unique_flights = np.unique(np.unique(cell * n_acids + acid_id) // n_acids, return_counts=True)
+
+    by_first_seen = np.argsort(np.minimum.reduceat(occupied, starts), kind="stable")
+    return (
+        np.minimum.reduceat(occupied, starts)[by_first_seen],
+        np.maximum.reduceat(density, starts)[by_first_seen],
+        (ends - starts)[by_first_seen],
+        unique_flights[by_first_seen],
+        time_bin[occupied[starts]][by_first_seen],
+        time_bin[occupied[ends - 1]][by_first_seen],
+    )
 
 
 def detect_hotspots(
-    trajectories: Dict[str, List[TrajectoryPoint]],
+    trajectories: Union[Dict[str, List[TrajectoryPoint]], TrajBuffer],
     config: HotspotConfig | None = None,
 ) -> List[HotspotCell]:
     if config is None:
         config = HotspotConfig()
 
-    occupancy: Dict[Tuple[int, int, int, int], List[TrajectoryPoint]] = defaultdict(list)
-
-    for points in trajectories.values():
-        for point in points:
-            key = (
-                _bucket(point.lat, config.lat_bucket_deg),
-                _bucket(point.lon, config.lon_bucket_deg),
-                _bucket(point.altitude_ft, config.altitude_band_ft),
-                int(point.timestamp // config.time_bin_sec),
-            )
-            occupancy[key].append(point)
-
-    cell_stats: Dict[Tuple[int, int, int], Dict[str, object]] = {}
-    for (lat_b, lon_b, alt_b, time_bin), points in occupancy.items():
-        cell_key = (lat_b, lon_b, alt_b)
-        stats = cell_stats.setdefault(
-            cell_key,
-            {
-                "peak_density": 0,
-                "time_bins": set(),
-                "flights": set(),
-            },
-        )
-        stats["peak_density"] = max(stats["peak_density"], len(points))
-        stats["time_bins"].add(time_bin)
-        stats["flights"].update(p.acid for p in points)
+    if isinstance(trajectories, TrajBuffer):
+        buffer = trajectories
+    else:
+        buffer = flatten_trajectories(trajectories)
+    if not len(buffer):
+        return []
+
+    lat_b = _bucket(buffer.lat, config.lat_bucket_deg)
+    lon_b = _bucket(buffer.lon, config.lon_bucket_deg)
+    alt_b = _bucket(buffer.alt, config.altitude_band_ft)
+    cell = _pack([lat_b, lon_b, alt_b])
+    time_bin = buffer.ts // config.time_bin_sec
+    stats_fn = hotspots_core if NUMBA_AVAILABLE else _cell_stats
+    first_seen, peak_density, occupied_bins, unique_flights, first_bin, last_bin = stats_fn(
+        cell, _pack([cell, time_bin]), time_bin, buffer.acid_id, len(buffer.acid_names)
+    )
+    occupancy_minutes = occupied_bins * int(config.time_bin_sec / 60)
+
+    raw_scores = peak_density * 0.6 + unique_flights * 0.3 + occupancy_minutes * 0.1
+    scores = [round(score, 4) for score in raw_scores.tolist()]
+
+    # Cells are in first-seen order, so ties keep the order the points arrived in.
+    ranked = sorted(range(len(scores)), key=lambda idx: scores[idx], reverse=True)
 
     hotspots: List[HotspotCell] = []
-    for (lat_b, lon_b, alt_b), stats in cell_stats.items():
-        time_bins = sorted(stats["time_bins"])
-        if not time_bins:
-            continue
-
-        time_start = time_bins[0] * config.time_bin_sec
-        time_end = (time_bins[-1] + 1) * config.time_bin_sec
-        occupancy_minutes = len(time_bins) * int(config.time_bin_sec / 60)
-        unique_flights = len(stats["flights"])
-        peak_density = int(stats["peak_density"])
-
-        score = round(peak_density * 0.6 + unique_flights * 0.3 + occupancy_minutes * 0.1, 4)
-
+    for idx in ranked[: config.top_n]:
+        first = first_seen[idx]
         hotspots.append(
             HotspotCell(
-                lat_bucket=lat_b,
-                lon_bucket=lon_b,
-                altitude_band=alt_b,
-                time_start=time_start,
-                time_end=time_end,
-                peak_density=peak_density,
-                occupancy_minutes=occupancy_minutes,
-                unique_flights=unique_flights,
-                score=score,
+                lat_bucket=int(lat_b[first]),
+                lon_bucket=int(lon_b[first]),
+                altitude_band=int(alt_b[first]),
+                time_start=int(first_bin[idx]) * config.time_bin_sec,
+                time_end=(int(last_bin[idx]) + 1) * config.time_bin_sec,
+                peak_density=int(peak_density[idx]),
+                occupancy_minutes=int(occupancy_minutes[idx]),
+                unique_flights=int(unique_flights[idx]),
+                score=scores[idx],
             )
         )
 
-    hotspots.sort(key=lambda h: h.score, reverse=True)
-    return hotspots[: config.top_n]
+    return hotspots
@@ -1,19 +1,57 @@
-import json
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+import orjson
 from fastapi import Body, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
 
+from ._numba import NUMBA_AVAILABLE
 from .conflicts import detect_conflicts
 from .hotspots import HotspotConfig, detect_hotspots
 from .models import FlightPlan, TrajectoryPoint, validate_flight_plan
 from .parsing import parse_route
 from .resolver import propose_resolutions
-from .trajectory import build_trajectory
+from .trajectory import build_trajectory_array, flatten_trajectory_arrays, trajectory_points
+
+# Two crossing flights, enough to run every compiled kernel once.
+_WARM_UP_PAYLOAD = [
+    {
+        "ACID": acid,
+        "Plane type": "jet",
+        "route": route,
+        "altitude": 30000,
+        "departure time": 0,
+        "aircraft speed": 450,
+        "passengers": 100,
+        "is_cargo": False,
+    }
+    for acid, route in (("WARM1", "45.00N/75.00W 46.00N/74.00W"), ("WARM2", "46.00N/75.00W 45.00N/74.00W"))
+]
+
+
+def _warm_up_kernels() -> None:
+    """Compile the Numba kernels at startup instead of on the first request.
+
+    ``cache=True`` does not help a fresh container or a read-only
+    ``__pycache__``, where compiling them all takes several seconds.
+    """
+    _, buffer = _trajectory_buffer(_WARM_UP_PAYLOAD)
+    detect_conflicts(buffer)
+    detect_hotspots(buffer, HotspotConfig())
 
-app = FastAPI(title="Trajectory Insight API")
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    if NUMBA_AVAILABLE:
+        _warm_up_kernels()
+    yield
+
+
+app = FastAPI(title="Trajectory Insight API", lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -34,8 +72,7 @@ DATA_FILE_PATH = Path(__file__).resolve().parents[2] / "canadian_flights_1000.js
 def load_data() -> List[dict]:
     if not DATA_FILE_PATH.exists():
         return []
-    with DATA_FILE_PATH.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = orjson.loads(DATA_FILE_PATH.read_bytes())
     if not isinstance(payload, list):
         return []
     return payload
@@ -59,8 +96,7 @@ def save_data(payload: List[dict] = Body(...)) -> Dict[str, object]:
             shutil.copy(DATA_FILE_PATH, backup_path)
         
         # Save the new data
-        with DATA_FILE_PATH.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2, ensure_ascii=False)
+        DATA_FILE_PATH.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
         
         return {
             "success": True,
@@ -82,7 +118,7 @@ def _parse_flights(payload: List[dict]) -> Tuple[List[FlightPlan], List[str]]:
 
         acid = _get_acid(item, index)
         try:
-            flight = FlightPlan.parse_obj(item)
+            flight = FlightPlan.model_validate(item)
         except ValidationError as exc:
             issues.append(f"{acid}: invalid flight plan ({exc.errors()})")
             continue
@@ -93,8 +129,8 @@ def _parse_flights(payload: List[dict]) -> Tuple[List[FlightPlan], List[str]]:
     return flights, issues
 
 
-def _build_trajectories(flights: List[FlightPlan]) -> Tuple[Dict[str, List[TrajectoryPoint]], List[str]]:
-    trajectories: Dict[str, List[TrajectoryPoint]] = {}
+def _build_trajectory_arrays(flights: List[FlightPlan]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    trajectories: Dict[str, np.ndarray] = {}
     issues: List[str] = []
     for flight in flights:
         try:
@@ -107,10 +143,34 @@ def _build_trajectories(flights: List[FlightPlan]) -> Tuple[Dict[str, List[Traje
         except ValueError as exc:
             issues.append(f"{flight.acid}: {exc}")
             continue
-        trajectories[flight.acid] = build_trajectory(flight, route_points)
+        trajectories[flight.acid] = build_trajectory_array(flight, route_points)
     return trajectories, issues
 
 
+def _build_trajectories(flights: List[FlightPlan]) -> Tuple[Dict[str, List[TrajectoryPoint]], List[str]]:
+    arrays, issues = _build_trajectory_arrays(flights)
+    return {acid: trajectory_points(acid, trajectory) for acid, trajectory in arrays.items()}, issues
+
+
+def _point_dicts(acid: str, trajectory: np.ndarray) -> List[dict]:
+    return [
+        {"acid": acid, "lat": lat, "lon": lon, "altitude_ft": altitude_ft, "timestamp": timestamp, "speed_kt": speed_kt}
+        for lat, lon, altitude_ft, timestamp, speed_kt in zip(
+            trajectory["lat"].tolist(),
+            trajectory["lon"].tolist(),
+            trajectory["alt"].tolist(),
+            trajectory["ts"].tolist(),
+            trajectory["spd"].tolist(),
+        )
+    ]
+
+
+def _trajectory_buffer(payload: List[dict]):
+    flights, _ = _parse_flights(payload)
+    arrays, _ = _build_trajectory_arrays(flights)
+    return flights, flatten_trajectory_arrays(arrays)
+
+
 @app.post("/validate")
 def validate(payload: List[dict] = Body(...)) -> List[str]:
     _, issues = _parse_flights(payload)
@@ -126,24 +186,23 @@ def trajectory(payload: List[dict] = Body(...)) -> Dict[str, List[TrajectoryPoin
 
 @app.post("/conflicts")
 def conflicts(payload: List[dict] = Body(...)) -> List[dict]:
-    trajectories = trajectory(payload)
-    return [conflict.dict() for conflict in detect_conflicts(trajectories)]
+    _, buffer = _trajectory_buffer(payload)
+    return [asdict(conflict) for conflict in detect_conflicts(buffer)]
 
 
 @app.post("/hotspots")
 def hotspots(payload: List[dict] = Body(...)) -> List[dict]:
-    trajectories = trajectory(payload)
-    return [cell.dict() for cell in detect_hotspots(trajectories, HotspotConfig())]
+    _, buffer = _trajectory_buffer(payload)
+    return [asdict(cell) for cell in detect_hotspots(buffer, HotspotConfig())]
 
 
 @app.post("/propose")
 def propose(payload: List[dict] = Body(...)) -> Dict[str, List[dict]]:
-    flights, _ = _parse_flights(payload)
+    flights, buffer = _trajectory_buffer(payload)
     flight_map = {flight.acid: flight for flight in flights}
-    trajectories, _ = _build_trajectories(flights)
-    conflicts_list = detect_conflicts(trajectories)
+    conflicts_list = detect_conflicts(buffer)
     proposals = propose_resolutions(conflicts_list, flight_map)
-    return {key: [candidate.dict() for candidate in values] for key, values in proposals.items()}
+    return {key: [candidate.model_dump() for candidate in values] for key, values in proposals.items()}
 
 
 @app.post("/apply")
@@ -169,9 +228,9 @@ def apply_changes(payload: Dict = Body(...)) -> Dict[str, object]:
         if action.get("reroute_waypoint"):
             updates["route"] = f"{flight.route} {action['reroute_waypoint']}"
 
-        flight_map[flight_id] = flight.copy(update=updates)
+        flight_map[flight_id] = flight.model_copy(update=updates)
 
-    revised = [flight.dict(by_alias=True) for flight in flight_map.values()]
+    revised = [flight.model_dump(by_alias=True) for flight in flight_map.values()]
     return {"issues": issues, "revised": revised}
 
 
@@ -179,15 +238,17 @@ def apply_changes(payload: Dict = Body(...)) -> Dict[str, object]:
 def analyze(payload: List[dict] = Body(...)) -> Dict[str, object]:
     flights, issues = _parse_flights(payload)
     flight_map = {flight.acid: flight for flight in flights}
-    trajectories, route_issues = _build_trajectories(flights)
+    trajectories, route_issues = _build_trajectory_arrays(flights)
     issues.extend(route_issues)
-    conflicts_list = detect_conflicts(trajectories)
-    hotspots_list = detect_hotspots(trajectories, HotspotConfig())
+    # Both detectors read the same flattened points.
+    buffer = flatten_trajectory_arrays(trajectories)
+    conflicts_list = detect_conflicts(buffer)
+    hotspots_list = detect_hotspots(buffer, HotspotConfig())
     proposals = propose_resolutions(conflicts_list, flight_map)
     return {
         "issues": issues,
-        "trajectories": {key: [point.dict() for point in values] for key, values in trajectories.items()},
-        "conflicts": [conflict.dict() for conflict in conflicts_list],
-        "hotspots": [cell.dict() for cell in hotspots_list],
-        "proposals": {key: [candidate.dict() for candidate in values] for key, values in proposals.items()},
+        "trajectories": {key: _point_dicts(key, values) for key, values in trajectories.items()},
+        "conflicts": [asdict(conflict) for conflict in conflicts_list],
+        "hotspots": [asdict(cell) for cell in hotspots_list],
+        "proposals": {key: [candidate.model_dump() for candidate in values] for key, values in proposals.items()},
     }
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 @dataclass(frozen=True)
@@ -99,6 +100,8 @@ CATEGORY_TO_CONSTRAINTS = {
 }
 
 
+# Payloads repeat a handful of plane type strings, so cache the substring scan.
+@lru_cache(maxsize=4096)
 def _classify_aircraft(plane_type: str) -> Tuple[str, bool]:
     normalized = (plane_type or "").strip().lower()
     if not normalized:
@@ -129,6 +132,8 @@ def _classify_aircraft(plane_type: str) -> Tuple[str, bool]:
 
 
 class FlightPlan(BaseModel):
+    model_config = ConfigDict(validate_by_name=True, str_strip_whitespace=True)
+
     acid: str = Field(..., alias="ACID")
     plane_type: str = Field(..., alias="Plane type")
     route: str
@@ -140,18 +145,20 @@ class FlightPlan(BaseModel):
     departure_airport: Optional[str] = Field(None, alias="departure airport")
     arrival_airport: Optional[str] = Field(None, alias="arrival airport")
 
-    @validator("altitude_ft", "departure_time", "speed_kt", "passengers", pre=True)
+    @field_validator("altitude_ft", "departure_time", "speed_kt", "passengers", mode="before")
+    @classmethod
     def _coerce_int(cls, value: object) -> int:
         if isinstance(value, bool):
             raise ValueError("expected integer, got boolean")
         return int(value)
 
-    class Config:
-        allow_population_by_field_name = True
-        anystr_strip_whitespace = True
-
 
-class TrajectoryPoint(BaseModel):
+# Trajectory points and detector outputs are plain value objects: they are
+# created in bulk from already-validated data and only read back or
+# serialized, so they skip model validation. Points are not frozen because
+# a frozen __init__ costs several times more per instance.
+@dataclass(slots=True)
+class TrajectoryPoint:
     acid: str
     lat: float
     lon: float
@@ -160,7 +167,8 @@ class TrajectoryPoint(BaseModel):
     speed_kt: Optional[int] = None
 
 
-class ConflictEvent(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ConflictEvent:
     flight_a: str
     flight_b: str
     start_time: int
@@ -170,7 +178,8 @@ class ConflictEvent(BaseModel):
     severity: float
 
 
-class HotspotCell(BaseModel):
+@dataclass(frozen=True, slots=True)
+class HotspotCell:
     lat_bucket: int
     lon_bucket: int
     altitude_band: int
@@ -60,8 +60,30 @@ AIRPORT_COORDINATES = {
 }
 
 
+_LAT_SIGN = {"N": 1.0, "n": 1.0, "S": -1.0, "s": -1.0}
+_LON_SIGN = {"E": 1.0, "e": 1.0, "W": -1.0, "w": -1.0}
+
+
+def _is_degrees(text: str) -> bool:
+    """True for ``DDD`` or ``DDD.DDD``, the forms WAYPOINT_RE's degree groups accept."""
+    return text.replace(".", "", 1).isdecimal() and text[0] != "." and text[-1] != "."
+
+
 def parse_waypoint(token: str) -> Tuple[float, float]:
-    match = WAYPOINT_RE.match(token.strip())
+    text = token.strip()
+
+    # Fast path for the canonical DDD.DDDD[NS]/DDD.DDDD[EW] form, avoiding
+    # the regex match and group lookups; anything else goes to the regex.
+    lat_part, _, lon_part = text.partition("/")
+    lat_sign = _LAT_SIGN.get(lat_part[-1:])
+    lon_sign = _LON_SIGN.get(lon_part[-1:])
+    if lat_sign is not None and lon_sign is not None:
+        lat_deg = lat_part[:-1]
+        lon_deg = lon_part[:-1]
+        if _is_degrees(lat_deg) and _is_degrees(lon_deg):
+            return lat_sign * float(lat_deg), lon_sign * float(lon_deg)
+
+    match = WAYPOINT_RE.match(text)
     if not match:
         raise ValueError(f"invalid waypoint: {token!r}")
 
@@ -97,9 +119,7 @@ def parse_route(
     if not route_str or not route_str.strip():
         raise ValueError("route is empty")
 
-    points: List[Tuple[float, float]] = []
-    for token in route_str.split():
-        points.append(parse_waypoint(token))
+    points: List[Tuple[float, float]] = [parse_waypoint(token) for token in route_str.split()]
 
     # If only one waypoint, try to expand using airports
     if len(points) == 1:
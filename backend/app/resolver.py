@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from .models import ConflictEvent, FlightPlan, ResolutionCandidate, validate_flight_plan
-from .scoring import score_candidate
+import numpy as np
+
+from .models import (
+    AIRCRAFT_CONSTRAINTS,
+    AircraftConstraints,
+    ConflictEvent,
+    FlightPlan,
+    ResolutionCandidate,
+    _classify_aircraft,
+)
+from .scoring import candidate_costs, conflict_benefit
 
 
 ALTITUDE_STEPS = [-4000, -2000, 2000, 4000]
@@ -19,6 +28,8 @@ def _candidate(
     delta_speed_kt: int | None = None,
     delta_departure_min: int | None = None,
     reroute_waypoint: str | None = None,
+    benefit: float = 0.0,
+    cost: float = 0.0,
 ) -> ResolutionCandidate:
     return ResolutionCandidate(
         flight_id=flight_id,
@@ -28,16 +39,75 @@ def _candidate(
         delta_speed_kt=delta_speed_kt,
         delta_departure_min=delta_departure_min,
         reroute_waypoint=reroute_waypoint,
-        score=0.0,
-        benefit=0.0,
-        cost=0.0,
+        score=round(benefit - cost, 4),
+        benefit=benefit,
+        cost=cost,
+    )
+
+
+def _constraints_for(flight: FlightPlan) -> Optional[AircraftConstraints]:
+    # validate_flight_plan reports unknown plane types as an issue, so no
+    # delta can make such a flight valid.
+    category, matched = _classify_aircraft(flight.plane_type)
+    return AIRCRAFT_CONSTRAINTS[category] if matched else None
+
+
+def _valid_with_delta(
+    flight: FlightPlan,
+    constraints: Optional[AircraftConstraints],
+    delta_alt: int = 0,
+    delta_speed: int = 0,
+    delta_dep_min: int = 0,
+) -> bool:
+    if constraints is None:
+        return False
+    altitude = flight.altitude_ft + delta_alt
+    speed = flight.speed_kt + delta_speed
+    return (
+        constraints.min_altitude_ft <= altitude <= constraints.max_altitude_ft
+        and constraints.min_speed_kt <= speed <= constraints.max_speed_kt
     )
 
 
-def _valid_with_delta(flight: FlightPlan, delta_alt: int = 0, delta_speed: int = 0, delta_dep_min: int = 0) -> bool:
-    updated = flight.copy(update={"altitude_ft": flight.altitude_ft + delta_alt, "speed_kt": flight.speed_kt + delta_speed})
-    issues = validate_flight_plan(updated)
-    return len(issues) == 0
+# Positional arguments for ``_candidate``.
+_CandidateSpec = Tuple[str, str, str, Optional[int], Optional[int], Optional[int], Optional[str]]
+
+
+def _candidate_specs(flight_id: str, flight: FlightPlan) -> List[_CandidateSpec]:
+    """Arguments for every valid ``_candidate`` of a flight.
+
+    Validity only depends on the flight, so the specs are built once per
+    flight and turned into fresh candidates for each conflict it is in,
+    since every conflict gives them a different benefit and score.
+    """
+    constraints = _constraints_for(flight)
+    specs: List[_CandidateSpec] = []
+
+    for delta in ALTITUDE_STEPS:
+        if _valid_with_delta(flight, constraints, delta_alt=delta):
+            specs.append((flight_id, "altitude", f"Change altitude by {delta:+} ft", delta, None, None, None))
+
+    for delta in SPEED_STEPS:
+        if _valid_with_delta(flight, constraints, delta_speed=delta):
+            specs.append((flight_id, "speed", f"Change speed by {delta:+} kt", None, delta, None, None))
+
+    for delta in DEPARTURE_STEPS:
+        specs.append((flight_id, "departure", f"Shift departure by {delta:+} min", None, None, delta, None))
+
+    if flight.route:
+        specs.append((flight_id, "reroute", "Insert waypoint FIX01", None, None, None, "FIX01"))
+
+    return specs
+
+
+def _spec_costs(specs: List[_CandidateSpec]) -> List[float]:
+    _, _, _, altitude, speed, departure, reroute = zip(*specs)
+    return candidate_costs(
+        np.array([delta or 0 for delta in departure], dtype=np.float64),
+        np.array([delta or 0 for delta in altitude], dtype=np.float64),
+        np.array([delta or 0 for delta in speed], dtype=np.float64),
+        np.array([bool(waypoint) for waypoint in reroute]),
+    )
 
 
 def propose_resolutions(
@@ -45,58 +115,23 @@ def propose_resolutions(
     flights: Dict[str, FlightPlan],
 ) -> Dict[str, List[ResolutionCandidate]]:
     proposals: Dict[str, List[ResolutionCandidate]] = {}
+    # A candidate's cost only depends on its flight, so specs and costs are
+    # worked out once per flight; each conflict then only adds its benefit.
+    specs_by_flight: Dict[str, Tuple[List[_CandidateSpec], List[float]]] = {}
 
     for conflict in conflicts:
+        benefit = conflict_benefit(conflict)
         for flight_id in (conflict.flight_a, conflict.flight_b):
             flight = flights.get(flight_id)
             if not flight:
                 continue
+            entry = specs_by_flight.get(flight_id)
+            if entry is None:
+                specs = _candidate_specs(flight_id, flight)
+                entry = specs_by_flight[flight_id] = (specs, _spec_costs(specs))
 
-            candidates: List[ResolutionCandidate] = []
-
-            for delta in ALTITUDE_STEPS:
-                if _valid_with_delta(flight, delta_alt=delta):
-                    candidates.append(
-                        _candidate(
-                            flight_id,
-                            "altitude",
-                            f"Change altitude by {delta:+} ft",
-                            delta_altitude_ft=delta,
-                        )
-                    )
-
-            for delta in SPEED_STEPS:
-                if _valid_with_delta(flight, delta_speed=delta):
-                    candidates.append(
-                        _candidate(
-                            flight_id,
-                            "speed",
-                            f"Change speed by {delta:+} kt",
-                            delta_speed_kt=delta,
-                        )
-                    )
-
-            for delta in DEPARTURE_STEPS:
-                candidates.append(
-                    _candidate(
-                        flight_id,
-                        "departure",
-                        f"Shift departure by {delta:+} min",
-                        delta_departure_min=delta,
-                    )
-                )
-
-            if flight.route:
-                candidates.append(
-                    _candidate(
-                        flight_id,
-                        "reroute",
-                        "Insert waypoint FIX01",
-                        reroute_waypoint="FIX01",
-                    )
-                )
-
-            scored = [score_candidate(candidate, conflict) for candidate in candidates]
+            specs, costs = entry
+            scored = [_candidate(*spec, benefit=benefit, cost=cost) for spec, cost in zip(specs, costs)]
             scored.sort(key=lambda c: c.score, reverse=True)
             key = f"{conflict.flight_a}-{conflict.flight_b}:{flight_id}"
             proposals[key] = scored[:3]
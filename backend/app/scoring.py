@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Sequence
+
+import numpy as np
 
 from .models import ConflictEvent, FlightPlan, ResolutionCandidate
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScoreWeights:
     conflict_weight: float = 1.0
     delay_weight: float = 0.04
@@ -15,28 +17,91 @@ class ScoreWeights:
     complexity_weight: float = 0.2
 
 
-def score_candidate(
-    candidate: ResolutionCandidate,
-    conflict: ConflictEvent,
-    weights: Optional[ScoreWeights] = None,
-) -> ResolutionCandidate:
-    if weights is None:
-        weights = ScoreWeights()
+_DEFAULT_WEIGHTS = ScoreWeights()
 
+
+def _cost(candidate: ResolutionCandidate, weights: ScoreWeights) -> float:
     delay = abs(candidate.delta_departure_min or 0)
     altitude = abs(candidate.delta_altitude_ft or 0)
     speed = abs(candidate.delta_speed_kt or 0)
     complexity = 1.0 if candidate.reroute_waypoint else 0.3
 
-    benefit = round(conflict.severity * weights.conflict_weight, 4)
-    cost = round(
+    return round(
         delay * weights.delay_weight
         + altitude * weights.altitude_weight
         + speed * weights.speed_weight
         + complexity * weights.complexity_weight,
         4,
     )
+
+
+def conflict_benefit(conflict: ConflictEvent, weights: Optional[ScoreWeights] = None) -> float:
+    if weights is None:
+        weights = _DEFAULT_WEIGHTS
+    return round(conflict.severity * weights.conflict_weight, 4)
+
+
+def candidate_costs(
+    delay_min: np.ndarray,
+    altitude_ft: np.ndarray,
+    speed_kt: np.ndarray,
+    reroute: np.ndarray,
+    weights: Optional[ScoreWeights] = None,
+) -> List[float]:
+    """Rounded cost of each candidate, from its deltas as parallel arrays.
+
+    Missing deltas are passed as 0. The sum runs in float64 in the same
+    order as ``_cost``, so both give identical costs.
+    """
+    if weights is None:
+        weights = _DEFAULT_WEIGHTS
+
+    cost = (
+        np.abs(delay_min) * weights.delay_weight
+        + np.abs(altitude_ft) * weights.altitude_weight
+        + np.abs(speed_kt) * weights.speed_weight
+        + np.where(reroute, 1.0, 0.3) * weights.complexity_weight
+    )
+    return [round(value, 4) for value in cost.tolist()]
+
+
+def score_candidate(
+    candidate: ResolutionCandidate,
+    conflict: ConflictEvent,
+    weights: Optional[ScoreWeights] = None,
+) -> ResolutionCandidate:
+    if weights is None:
+        weights = _DEFAULT_WEIGHTS
+
+    benefit = round(conflict.severity * weights.conflict_weight, 4)
+    cost = _cost(candidate, weights)
     candidate.benefit = benefit
     candidate.cost = cost
     candidate.score = round(benefit - cost, 4)
     return candidate
+
+
+def score_candidates(
+    candidates: Sequence[ResolutionCandidate],
+    conflict: ConflictEvent,
+    weights: Optional[ScoreWeights] = None,
+) -> List[ResolutionCandidate]:
+    """Score every candidate for one conflict, as ``score_candidate`` would.
+
+    The benefit only depends on the conflict, so it is computed once, and
+    the costs come from one vectorized pass over the candidates' deltas.
+    """
+    count = len(candidates)
+    costs = candidate_costs(
+        np.fromiter((c.delta_departure_min or 0 for c in candidates), dtype=np.float64, count=count),
+        np.fromiter((c.delta_altitude_ft or 0 for c in candidates), dtype=np.float64, count=count),
+        np.fromiter((c.delta_speed_kt or 0 for c in candidates), dtype=np.float64, count=count),
+        np.fromiter((bool(c.reroute_waypoint) for c in candidates), dtype=bool, count=count),
+        weights,
+    )
+    benefit = conflict_benefit(conflict, weights)
+    for candidate, cost in zip(candidates, costs):
+        candidate.benefit = benefit
+        candidate.cost = cost
+        candidate.score = round(benefit - cost, 4)
+    return list(candidates)
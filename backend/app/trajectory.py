@@ -1,84 +1,215 @@
 from __future__ import annotations
 
 import math
-from typing import List, Sequence, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
+
+from ._numba import NUMBA_AVAILABLE
+from ._trajectory_kernel import EARTH_RADIUS_NM, segment_distances, trajectory_core
 from .models import FlightPlan, TrajectoryPoint
 
-EARTH_RADIUS_NM = 3440.065
+# Module-level aliases save an attribute lookup per call on the scalar path.
+_sin, _cos, _asin, _sqrt = math.sin, math.cos, math.asin, math.sqrt
+# Same factor math.radians multiplies by, so results are unchanged.
+_DEG2RAD = math.pi / 180.0
 
 
-def great_circle_nm(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
-    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+def great_circle_nm(a: Sequence[float], b: Sequence[float]) -> float:
+    return _great_circle_nm(a[0], a[1], b[0], b[1])
 
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    sin_dlat = math.sin(dlat / 2.0)
-    sin_dlon = math.sin(dlon / 2.0)
-    h = sin_dlat * sin_dlat + math.cos(lat1) * math.cos(lat2) * sin_dlon * sin_dlon
-    return 2.0 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(h)))
 
+# Routes share airports and fixes, so the same legs recur across flights.
+# Keyed on the coordinates themselves so list and array points hash too.
+@lru_cache(maxsize=8192)
+def _great_circle_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1 = lat1 * _DEG2RAD, lon1 * _DEG2RAD
+    lat2, lon2 = lat2 * _DEG2RAD, lon2 * _DEG2RAD
 
-def _segment_distances(points: Sequence[Tuple[float, float]]) -> List[float]:
-    distances = []
-    for idx in range(len(points) - 1):
-        distances.append(great_circle_nm(points[idx], points[idx + 1]))
-    return distances
+    sin_dlat = _sin((lat2 - lat1) / 2.0)
+    sin_dlon = _sin((lon2 - lon1) / 2.0)
+    h = sin_dlat * sin_dlat + _cos(lat1) * _cos(lat2) * sin_dlon * sin_dlon
+    # Near antipodes h can round past 1; clamping the root keeps asin in domain.
+    root = _sqrt(h)
+    if root > 1.0:
+        root = 1.0
+    return 2.0 * EARTH_RADIUS_NM * _asin(root)
 
 
-def _interpolate(a: Tuple[float, float], b: Tuple[float, float], t: float) -> Tuple[float, float]:
-    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+def _haversine_nm(
+    phi1: np.ndarray, lam1: np.ndarray, cos_phi1: np.ndarray,
+    phi2: np.ndarray, lam2: np.ndarray, cos_phi2: np.ndarray,
+) -> np.ndarray:
+    """NumPy ``great_circle_nm`` from radians and a precomputed cos(latitude)."""
+    sin_dphi = np.sin((phi2 - phi1) / 2.0)
+    sin_dlam = np.sin((lam2 - lam1) / 2.0)
+    h = sin_dphi * sin_dphi + cos_phi1 * cos_phi2 * sin_dlam * sin_dlam
+    return 2.0 * EARTH_RADIUS_NM * np.arcsin(np.minimum(1.0, np.sqrt(h)))
 
 
-def build_trajectory(
+# Routes shorter than this are cheaper to measure pair by pair than to
+# hand to NumPy, whose per-call overhead dominates for a few legs.
+VECTORIZE_MIN_POINTS = 32
+
+
+def _segment_distances(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    if len(points) < VECTORIZE_MIN_POINTS:
+        return np.array(
+            [great_circle_nm(points[idx], points[idx + 1]) for idx in range(len(points) - 1)], dtype=np.float64
+        )
+
+    coords = np.radians(np.asarray(points, dtype=np.float64))
+    phi, lam = coords[:, 0], coords[:, 1]
+    cos_phi = np.cos(phi)
+    return _haversine_nm(phi[:-1], lam[:-1], cos_phi[:-1], phi[1:], lam[1:], cos_phi[1:])
+
+
+def _sample_positions(
+    coords: np.ndarray, distances: np.ndarray, advance_nm: float, n_samples: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy counterpart of ``trajectory_core``.
+
+    A segment keeps the samples while its remaining distance, reduced by
+    ``advance_nm`` per tick, stays positive, and progress restarts at zero
+    on the next segment. Both running values go through ``accumulate`` so
+    they round exactly like the loop's repeated ``+=``/``-=``.
+    """
+    lat = np.full(n_samples, coords[-1, 0])
+    lon = np.full(n_samples, coords[-1, 1])
+    start = 0
+    for index, distance in enumerate(distances.tolist()):
+        if start >= n_samples:
+            break
+        if distance <= 0:
+            continue
+
+        ticks = min(n_samples - start, int(math.ceil(distance / advance_nm)) + 2)
+        steps = np.full(ticks, advance_nm)
+        remaining = np.subtract.accumulate(np.concatenate(([distance], steps)))[1:]
+        exhausted = remaining <= 0
+        count = int(np.argmax(exhausted)) + 1 if exhausted.any() else ticks
+
+        progress = np.concatenate(([0.0], np.add.accumulate(steps[: count - 1])))
+        t = np.minimum(1.0, progress / max(1e-6, distance))
+        lat_a, lon_a = coords[index]
+        lat_b, lon_b = coords[index + 1]
+        lat[start : start + count] = lat_a + (lat_b - lat_a) * t
+        lon[start : start + count] = lon_a + (lon_b - lon_a) * t
+        start += count
+
+    return lat, lon
+
+
+# One row per trajectory sample; the flight id is kept alongside, not per row.
+TRAJ_DTYPE = np.dtype(
+    [("lat", np.float64), ("lon", np.float64), ("alt", np.int64), ("ts", np.int64), ("spd", np.int64)]
+)
+
+
+def build_trajectory_array(
     flight: FlightPlan, points: Sequence[Tuple[float, float]], sample_sec: int = 60
-) -> List[TrajectoryPoint]:
+) -> np.ndarray:
     if sample_sec <= 0:
         raise ValueError("sample_sec must be positive")
 
-    distances = _segment_distances(points)
-    total_nm = sum(distances)
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if NUMBA_AVAILABLE:
+        distances = segment_distances(coords)
+    else:
+        distances = _segment_distances(points)
+    # Summed left to right: ndarray.sum() pairs terms up and can move the
+    # total by an ulp, and with it the sample count.
+    total_nm = sum(distances.tolist())
     if total_nm <= 0:
         raise ValueError("route distance must be positive")
 
     speed_kt = max(1, flight.speed_kt)
     total_sec = int(math.ceil(total_nm / speed_kt * 3600.0))
 
-    trajectory: List[TrajectoryPoint] = []
-    elapsed = 0
-    segment_index = 0
-    segment_progress = 0.0
-    segment_remaining = distances[0]
-
-    while elapsed <= total_sec:
-        while segment_index < len(distances) and segment_remaining <= 0:
-            segment_index += 1
-            if segment_index < len(distances):
-                segment_remaining = distances[segment_index]
-                segment_progress = 0.0
-
-        if segment_index >= len(distances):
-            lat, lon = points[-1]
-        else:
-            segment_len = max(1e-6, distances[segment_index])
-            t = min(1.0, segment_progress / segment_len)
-            lat, lon = _interpolate(points[segment_index], points[segment_index + 1], t)
-
-        trajectory.append(
-            TrajectoryPoint(
-                acid=flight.acid,
-                lat=lat,
-                lon=lon,
-                altitude_ft=flight.altitude_ft,
-                timestamp=flight.departure_time + elapsed,
-                speed_kt=flight.speed_kt,
-            )
+    if NUMBA_AVAILABLE:
+        lats, lons = trajectory_core(coords, distances, speed_kt, sample_sec, total_sec)
+    else:
+        advance_nm = speed_kt * sample_sec / 3600.0
+        lats, lons = _sample_positions(coords, distances, advance_nm, total_sec // sample_sec + 1)
+
+    trajectory = np.empty(len(lats), dtype=TRAJ_DTYPE)
+    trajectory["lat"] = lats
+    trajectory["lon"] = lons
+    trajectory["alt"] = flight.altitude_ft
+    trajectory["ts"] = flight.departure_time + np.arange(len(lats), dtype=np.int64) * sample_sec
+    trajectory["spd"] = flight.speed_kt
+    return trajectory
+
+
+def trajectory_points(acid: str, trajectory: np.ndarray) -> List[TrajectoryPoint]:
+    return [
+        TrajectoryPoint(acid, lat, lon, altitude_ft, timestamp, speed_kt)
+        for lat, lon, altitude_ft, timestamp, speed_kt in zip(
+            trajectory["lat"].tolist(),
+            trajectory["lon"].tolist(),
+            trajectory["alt"].tolist(),
+            trajectory["ts"].tolist(),
+            trajectory["spd"].tolist(),
         )
+    ]
 
-        elapsed += sample_sec
-        advance_nm = speed_kt * sample_sec / 3600.0
-        segment_progress += advance_nm
-        segment_remaining -= advance_nm
 
-    return trajectory
+def build_trajectory(
+    flight: FlightPlan, points: Sequence[Tuple[float, float]], sample_sec: int = 60
+) -> List[TrajectoryPoint]:
+    return trajectory_points(flight.acid, build_trajectory_array(flight, points, sample_sec))
+
+
+@dataclass(frozen=True)
+class TrajBuffer:
+    """Trajectory points flattened into parallel arrays.
+
+    Points keep the iteration order of the trajectories they came from.
+    ``acid_id`` indexes ``acid_names``, which is sorted, so comparing ids
+    compares flight names.
+    """
+
+    lat: np.ndarray
+    lon: np.ndarray
+    alt: np.ndarray
+    ts: np.ndarray
+    acid_id: np.ndarray
+    acid_names: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def flatten_trajectories(trajectories: Dict[str, List[TrajectoryPoint]]) -> TrajBuffer:
+    points = [point for trajectory in trajectories.values() for point in trajectory]
+    count = len(points)
+    acid_names = sorted({point.acid for point in points})
+    acid_ids = {acid: idx for idx, acid in enumerate(acid_names)}
+    return TrajBuffer(
+        lat=np.fromiter((p.lat for p in points), dtype=np.float64, count=count),
+        lon=np.fromiter((p.lon for p in points), dtype=np.float64, count=count),
+        alt=np.fromiter((p.altitude_ft for p in points), dtype=np.int64, count=count),
+        ts=np.fromiter((p.timestamp for p in points), dtype=np.int64, count=count),
+        acid_id=np.fromiter((acid_ids[p.acid] for p in points), dtype=np.int64, count=count),
+        acid_names=acid_names,
+    )
+
+
+def flatten_trajectory_arrays(trajectories: Dict[str, np.ndarray]) -> TrajBuffer:
+    """``flatten_trajectories`` for trajectories built as ``TRAJ_DTYPE`` arrays."""
+    acid_names = sorted(trajectories)
+    acid_ids = {acid: idx for idx, acid in enumerate(acid_names)}
+    rows = np.concatenate(list(trajectories.values())) if trajectories else np.empty(0, dtype=TRAJ_DTYPE)
+    return TrajBuffer(
+        lat=np.ascontiguousarray(rows["lat"]),
+        lon=np.ascontiguousarray(rows["lon"]),
+        alt=np.ascontiguousarray(rows["alt"]),
+        ts=np.ascontiguousarray(rows["ts"]),
+        acid_id=np.repeat(
+            np.array([acid_ids[acid] for acid in trajectories], dtype=np.int64),
+            [len(trajectory) for trajectory in trajectories.values()],
+        ),
+        acid_names=acid_names,
+    )
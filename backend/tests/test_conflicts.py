@@ -0,0 +1,124 @@
+from backend.app.conflicts import detect_conflicts
+from backend.app.models import TrajectoryPoint
+from backend.app.trajectory import flatten_trajectories
+
+
+def _track(acid, lat, lon, altitude_ft, start=0, steps=5, dlon=0.01):
+    return [
+        TrajectoryPoint(
+            acid=acid,
+            lat=lat,
+            lon=lon + dlon * step,
+            altitude_ft=altitude_ft,
+            timestamp=start + step * 60,
+            speed_kt=360,
+        )
+        for step in range(steps)
+    ]
+
+
+def test_detects_close_pair():
+    trajectories = {
+        "AAA1": _track("AAA1", 45.0, -75.0, 30000),
+        "BBB2": _track("BBB2", 45.02, -75.0, 31000),
+    }
+    conflicts = detect_conflicts(trajectories)
+    assert len(conflicts) == 1
+    conflict = conflicts[0]
+    assert (conflict.flight_a, conflict.flight_b) == ("AAA1", "BBB2")
+    assert conflict.start_time == 0
+    assert conflict.end_time == 5 * 60
+    assert conflict.min_vertical_ft == 1000
+    assert 1.0 < conflict.min_horizontal_nm < 1.5
+
+
+def test_ignores_vertically_separated_pair():
+    trajectories = {
+        "AAA1": _track("AAA1", 45.0, -75.0, 30000),
+        "BBB2": _track("BBB2", 45.0, -75.0, 34000),
+    }
+    assert detect_conflicts(trajectories) == []
+
+
+def test_detects_pair_across_bucket_edge():
+    trajectories = {
+        "AAA1": _track("AAA1", 44.99, -75.0, 30000),
+        "BBB2": _track("BBB2", 45.01, -75.0, 30000),
+    }
+    conflicts = detect_conflicts(trajectories)
+    assert len(conflicts) == 1
+    assert conflicts[0].min_vertical_ft == 0
+
+
+def test_detects_pair_across_prime_meridian():
+    trajectories = {
+        "AAA1": _track("AAA1", 51.5, -0.02, 30000, dlon=0.0),
+        "BBB2": _track("BBB2", 51.5, 0.02, 30000, dlon=0.0),
+    }
+    assert len(detect_conflicts(trajectories)) == 1
+
+
+def test_numpy_and_kernel_paths_agree(monkeypatch):
+    from backend.app import conflicts as conflicts_module
+
+    trajectories = {
+        "AAA1": _track("AAA1", 45.0, -75.0, 30000, steps=8),
+        "BBB2": _track("BBB2", 45.03, -75.02, 30500, start=20, steps=8),
+        "CCC3": _track("CCC3", 45.01, -74.98, 31500, start=40, steps=8),
+        "DDD4": _track("DDD4", 47.0, -75.0, 30000, steps=8),
+    }
+    monkeypatch.setattr(conflicts_module, "NUMBA_AVAILABLE", True)
+    kernel = detect_conflicts(trajectories)
+    monkeypatch.setattr(conflicts_module, "NUMBA_AVAILABLE", False)
+    vectorized = detect_conflicts(trajectories)
+    assert kernel == vectorized
+    assert len(kernel) == 3
+
+
+def test_accepts_flattened_buffer():
+    trajectories = {
+        "CCC3": _track("CCC3", 45.01, -74.98, 31500, start=40, steps=8),
+        "AAA1": _track("AAA1", 45.0, -75.0, 30000, steps=8),
+        "BBB2": _track("BBB2", 45.03, -75.02, 30500, start=20, steps=8),
+    }
+    buffer = flatten_trajectories(trajectories)
+    assert buffer.acid_names == ["AAA1", "BBB2", "CCC3"]
+    assert detect_conflicts(buffer) == detect_conflicts(trajectories)
+
+
+def test_bucket_sweep_matches_brute_force(monkeypatch):
+    from backend.app import conflicts as conflicts_module
+
+    trajectories = {
+        f"F{idx:02d}": _track(
+            f"F{idx:02d}", 45.0 + (idx % 9) * 0.05, -75.0 + (idx // 9) * 0.07, 30000 + (idx % 3) * 900, steps=2
+        )
+        for idx in range(80)
+    }
+    results = []
+    for use_kernel in (True, False):
+        for brute_force_max in (conflicts_module.BRUTE_FORCE_MAX_POINTS, 10**6):
+            monkeypatch.setattr(conflicts_module, "NUMBA_AVAILABLE", use_kernel)
+            monkeypatch.setattr(conflicts_module, "BRUTE_FORCE_MAX_POINTS", brute_force_max)
+            results.append(detect_conflicts(trajectories))
+    assert results[0]
+    assert all(result == results[0] for result in results)
+
+
+def test_merges_several_samples_per_bin():
+    # 20 s samples put three points of each flight in every 60 s bin, and
+    # BBB2 is offset so its hit times interleave with AAA1's.
+    trajectories = {
+        "AAA1": [
+            TrajectoryPoint(acid="AAA1", lat=45.0, lon=-75.0, altitude_ft=30000, timestamp=ts)
+            for ts in range(40, 200, 20)
+        ],
+        "BBB2": [
+            TrajectoryPoint(acid="BBB2", lat=45.02, lon=-75.0, altitude_ft=30000, timestamp=ts)
+            for ts in range(10, 200, 20)
+        ],
+    }
+    conflicts = detect_conflicts(trajectories)
+    assert len(conflicts) == 1
+    assert conflicts[0].start_time == 10
+    assert conflicts[0].end_time == 190 + 60
@@ -0,0 +1,47 @@
+import pytest
+
+from backend.app.hotspots import HotspotConfig, detect_hotspots
+from backend.app.models import TrajectoryPoint
+
+
+def _point(acid, lat, lon, timestamp, altitude_ft=30000):
+    return TrajectoryPoint(acid=acid, lat=lat, lon=lon, altitude_ft=altitude_ft, timestamp=timestamp)
+
+
+def test_hotspot_cell_stats():
+    trajectories = {
+        "AAA1": [_point("AAA1", 45.2, -75.5, 0), _point("AAA1", 45.4, -75.4, 60)],
+        "BBB2": [_point("BBB2", 45.6, -75.3, 0), _point("BBB2", 45.8, -75.2, 60)],
+        "CCC3": [_point("CCC3", 45.5, -75.5, 60), _point("CCC3", 47.5, -75.5, 120)],
+    }
+    hotspots = detect_hotspots(trajectories, HotspotConfig())
+    top = hotspots[0]
+    assert (top.lat_bucket, top.lon_bucket, top.altitude_band) == (45, -76, 15)
+    assert top.peak_density == 3
+    assert top.unique_flights == 3
+    assert top.occupancy_minutes == 2
+    assert (top.time_start, top.time_end) == (0, 120)
+    assert top.score == pytest.approx(3 * 0.6 + 3 * 0.3 + 2 * 0.1)
+    assert len(hotspots) == 2
+
+
+def test_hotspots_respect_top_n():
+    trajectories = {
+        f"F{idx}": [_point(f"F{idx}", 40.0 + idx * 2, -75.0, 0)] for idx in range(5)
+    }
+    assert len(detect_hotspots(trajectories, HotspotConfig(top_n=3))) == 3
+
+
+def test_numpy_and_kernel_paths_agree(monkeypatch):
+    from backend.app import hotspots as hotspots_module
+
+    trajectories = {
+        f"F{idx}": [_point(f"F{idx}", 45.0 + 0.3 * step, -75.0 + 0.2 * idx, step * 60) for step in range(6)]
+        for idx in range(8)
+    }
+    monkeypatch.setattr(hotspots_module, "NUMBA_AVAILABLE", True)
+    kernel = detect_hotspots(trajectories)
+    monkeypatch.setattr(hotspots_module, "NUMBA_AVAILABLE", False)
+    vectorized = detect_hotspots(trajectories)
+    assert kernel == vectorized
+    assert len(kernel) == 4
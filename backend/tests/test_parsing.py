@@ -18,3 +18,15 @@ def test_parse_waypoint_se():
 def test_parse_route_requires_two_points():
     with pytest.raises(ValueError):
         parse_route("49.97N/110.935W")
+
+
+def test_parse_waypoint_lowercase_and_whitespace():
+    lat, lon = parse_waypoint(" 45n/75.5w ")
+    assert lat == pytest.approx(45.0)
+    assert lon == pytest.approx(-75.5)
+
+
+@pytest.mark.parametrize("token", ["49.97N/110.935", "1e5N/2E", "49.N/110W", ".5N/110W", "49N/-110W", "49N/110W/3E"])
+def test_parse_waypoint_rejects_malformed(token):
+    with pytest.raises(ValueError):
+        parse_waypoint(token)
@@ -0,0 +1,39 @@
+import pytest
+
+from backend.app.models import FlightPlan, validate_flight_plan
+from backend.app.resolver import _constraints_for, _valid_with_delta
+
+
+def _flight(plane_type, altitude, speed):
+    return FlightPlan(
+        **{
+            "ACID": "TEST1",
+            "Plane type": plane_type,
+            "route": "0N/0E 0N/1E",
+            "altitude": altitude,
+            "departure time": 0,
+            "aircraft speed": speed,
+            "passengers": 100,
+            "is_cargo": False,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "plane_type,altitude,speed",
+    [
+        ("Boeing 737-800", 41000, 450),
+        ("Boeing 737-800", 12000, 210),
+        ("Dash 8-400", 39000, 440),
+        ("Cessna prop", 17000, 215),
+        ("Helicopter", 2000, 150),
+        ("Mystery craft", 30000, 400),
+    ],
+)
+@pytest.mark.parametrize("delta_alt,delta_speed", [(0, 0), (-4000, 0), (4000, 0), (0, -25), (0, 15)])
+def test_valid_with_delta_matches_validation(plane_type, altitude, speed, delta_alt, delta_speed):
+    flight = _flight(plane_type, altitude, speed)
+    updated = _flight(plane_type, altitude + delta_alt, speed + delta_speed)
+    expected = not validate_flight_plan(updated)
+    constraints = _constraints_for(flight)
+    assert _valid_with_delta(flight, constraints, delta_alt=delta_alt, delta_speed=delta_speed) == expected
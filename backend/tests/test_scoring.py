@@ -0,0 +1,68 @@
+from backend.app.models import ConflictEvent, ResolutionCandidate
+from backend.app.scoring import ScoreWeights, score_candidate, score_candidates
+
+
+def _conflict(severity=2.3456):
+    return ConflictEvent(
+        flight_a="AAA1",
+        flight_b="BBB2",
+        start_time=0,
+        end_time=120,
+        min_horizontal_nm=1.2,
+        min_vertical_ft=500,
+        severity=severity,
+    )
+
+
+def _candidates():
+    fields = [
+        dict(action_type="altitude", delta_altitude_ft=-4000),
+        dict(action_type="altitude", delta_altitude_ft=2000),
+        dict(action_type="speed", delta_speed_kt=-15),
+        dict(action_type="speed", delta_speed_kt=25),
+        dict(action_type="departure", delta_departure_min=-10),
+        dict(action_type="departure", delta_departure_min=2),
+        dict(action_type="reroute", reroute_waypoint="FIX01"),
+    ]
+    return [
+        ResolutionCandidate(flight_id="AAA1", summary="", score=0.0, benefit=0.0, cost=0.0, **extra)
+        for extra in fields
+    ]
+
+
+def test_batch_scoring_matches_single():
+    conflict = _conflict()
+    for weights in (None, ScoreWeights(delay_weight=0.13, complexity_weight=0.7)):
+        expected = [score_candidate(candidate, conflict, weights) for candidate in _candidates()]
+        scored = score_candidates(_candidates(), conflict, weights)
+        assert [c.model_dump() for c in scored] == [c.model_dump() for c in expected]
+
+
+def test_score_is_benefit_minus_cost():
+    candidate = score_candidate(_candidates()[0], _conflict(severity=10.0))
+    assert candidate.benefit == 10.0
+    assert candidate.cost == round(4000 * 0.002 + 0.3 * 0.2, 4)
+    assert candidate.score == round(candidate.benefit - candidate.cost, 4)
+
+
+def test_resolver_scores_match_score_candidate():
+    from backend.app.models import FlightPlan
+    from backend.app.resolver import propose_resolutions
+
+    flight = FlightPlan(
+        **{
+            "ACID": "AAA1",
+            "Plane type": "Boeing 737-800",
+            "route": "45N/75W 46N/76W",
+            "altitude": 30000,
+            "departure time": 0,
+            "aircraft speed": 420,
+            "passengers": 100,
+            "is_cargo": False,
+        }
+    )
+    conflict = _conflict()
+    proposals = propose_resolutions([conflict], {"AAA1": flight})
+    for candidate in proposals["AAA1-BBB2:AAA1"]:
+        rescored = score_candidate(candidate.model_copy(), conflict)
+        assert (rescored.benefit, rescored.cost, rescored.score) == (candidate.benefit, candidate.cost, candidate.score)
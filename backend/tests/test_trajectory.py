@@ -1,5 +1,19 @@
-from backend.app.models import FlightPlan
-from backend.app.trajectory import build_trajectory, great_circle_nm
+import math
+
+import numpy as np
+import pytest
+
+from backend.app.models import FlightPlan, TrajectoryPoint
+from backend.app.trajectory import (
+    EARTH_RADIUS_NM,
+    VECTORIZE_MIN_POINTS,
+    _segment_distances,
+    build_trajectory,
+    build_trajectory_array,
+    flatten_trajectories,
+    flatten_trajectory_arrays,
+    great_circle_nm,
+)
 
 
 def _flight():
@@ -22,6 +36,39 @@ def test_great_circle_distance():
     assert 59.9 < dist < 60.5
 
 
+def test_great_circle_distance_antipodal():
+    # h rounds to just above 1 for this pair.
+    dist = great_circle_nm((0.08, -90.0), (-0.08, 90.0))
+    assert abs(dist - math.pi * EARTH_RADIUS_NM) < 1e-6
+
+
+def test_vectorized_segment_distances_match_scalar():
+    points = [(43.0 + 0.37 * idx, -79.0 + 0.91 * idx) for idx in range(VECTORIZE_MIN_POINTS + 8)]
+    expected = [great_circle_nm(a, b) for a, b in zip(points, points[1:])]
+    distances = _segment_distances(points)
+    assert len(distances) == len(expected)
+    assert all(abs(got - want) < 1e-9 for got, want in zip(distances, expected))
+
+
+def test_compiled_segment_distances_match_scalar():
+    from backend.app._trajectory_kernel import segment_distances
+    from backend.app.conflicts import detect_conflicts
+
+    # The conflict kernel shares the compiled haversine; running it first
+    # must not leave a fastmath build behind for segment_distances.
+    detect_conflicts(
+        {
+            acid: [TrajectoryPoint(acid, 0.0, lon, 30000, 0, 360)]
+            for acid, lon in (("TEST1", 0.0), ("TEST2", 0.01))
+        }
+    )
+    points = [
+        (43.68, -79.63), (45.32, -75.67), (49.19, -123.18), (49.19, -123.18), (-33.9, 151.2), (0.02, 0.03), (0.5, 0.8),
+    ]
+    expected = [great_circle_nm(a, b) for a, b in zip(points, points[1:])]
+    assert segment_distances(np.asarray(points, dtype=np.float64)).tolist() == expected
+
+
 def test_build_trajectory_samples():
     flight = _flight()
     points = [(0.0, 0.0), (0.0, 1.0)]
@@ -29,3 +76,69 @@ def test_build_trajectory_samples():
     assert trajectory[0].timestamp == flight.departure_time
     assert trajectory[-1].timestamp >= flight.departure_time
     assert len(trajectory) > 1
+
+
+def test_numba_and_numpy_paths_agree(monkeypatch):
+    from backend.app import trajectory as trajectory_module
+
+    flight = _flight()
+    # Short legs make the sampler cross several segments per tick.
+    points = [(0.0, 0.0), (0.0, 0.01), (0.02, 0.03), (0.5, 0.8), (1.0, 1.0)]
+    monkeypatch.setattr(trajectory_module, "NUMBA_AVAILABLE", True)
+    compiled = build_trajectory(flight, points, sample_sec=60)
+    monkeypatch.setattr(trajectory_module, "NUMBA_AVAILABLE", False)
+    vectorized = build_trajectory(flight, points, sample_sec=60)
+    assert compiled == vectorized
+
+
+def test_repeated_waypoints_are_skipped(monkeypatch):
+    from backend.app import trajectory as trajectory_module
+
+    flight = _flight()
+    points = [(0.0, 0.0), (0.0, 0.0), (0.0, 0.5), (0.0, 0.5), (0.0, 0.5), (0.0, 1.0), (0.0, 1.0)]
+    monkeypatch.setattr(trajectory_module, "NUMBA_AVAILABLE", True)
+    compiled = build_trajectory(flight, points, sample_sec=60)
+    monkeypatch.setattr(trajectory_module, "NUMBA_AVAILABLE", False)
+    vectorized = build_trajectory(flight, points, sample_sec=60)
+    assert compiled == vectorized
+    assert compiled == build_trajectory(flight, [(0.0, 0.0), (0.0, 0.5), (0.0, 1.0)], sample_sec=60)
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_accepts_list_and_array_points(monkeypatch, numba_available):
+    from backend.app import trajectory as trajectory_module
+
+    monkeypatch.setattr(trajectory_module, "NUMBA_AVAILABLE", numba_available)
+    flight = _flight()
+    expected = build_trajectory(flight, [(0.0, 0.0), (0.0, 1.0)])
+    assert build_trajectory(flight, [[0.0, 0.0], [0.0, 1.0]]) == expected
+    assert build_trajectory(flight, np.array([[0.0, 0.0], [0.0, 1.0]])) == expected
+    assert great_circle_nm([0.0, 0.0], np.array([0.0, 1.0])) == great_circle_nm((0.0, 0.0), (0.0, 1.0))
+
+
+def test_build_trajectory_array_columns():
+    points = [(0.0, 0.0), (0.0, 1.0), (0.5, 1.5)]
+    trajectory = build_trajectory_array(_flight(), points)
+
+    # 360 kt sampled every 60 s moves 6 NM per row.
+    first_leg = great_circle_nm(points[0], points[1])
+    total_sec = math.ceil((first_leg + great_circle_nm(points[1], points[2])) / 360 * 3600)
+    assert len(trajectory) == total_sec // 60 + 1
+    assert trajectory["ts"].tolist() == [60 * idx for idx in range(len(trajectory))]
+    assert set(trajectory["alt"].tolist()) == {30000}
+    assert set(trajectory["spd"].tolist()) == {360}
+
+    assert (trajectory["lat"][0], trajectory["lon"][0]) == (0.0, 0.0)
+    assert abs(trajectory["lon"][1] - 6.0 / first_leg) < 1e-12
+    # The second leg starts afresh at its first waypoint once the first is used up.
+    second_leg_start = math.ceil(first_leg / 6.0)
+    assert (trajectory["lat"][second_leg_start], trajectory["lon"][second_leg_start]) == (0.0, 1.0)
+    assert trajectory["lat"][second_leg_start - 1] == 0.0
+    assert 0.0 < trajectory["lat"][-1] <= 0.5
+
+    expected = build_trajectory(_flight(), points)
+    from_arrays = flatten_trajectory_arrays({"TEST1": trajectory})
+    from_points = flatten_trajectories({"TEST1": expected})
+    assert from_arrays.acid_names == from_points.acid_names
+    for field in ("lat", "lon", "alt", "ts", "acid_id"):
+        assert getattr(from_arrays, field).tolist() == getattr(from_points, field).tolist()
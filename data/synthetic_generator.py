@@ -1,33 +1,57 @@
-import json
-import random
-from datetime import datetime, timezone
-
-
-def _rand_route():
-    start = (49.5 + random.random(), -111.2 + random.random())
-    mid = (49.0 + random.random(), -95.0 + random.random())
-    end = (45.0 + random.random(), -76.5 + random.random())
-    return f"{start[0]:.2f}N/{abs(start[1]):.2f}W {mid[0]:.2f}N/{abs(mid[1]):.2f}W {end[0]:.2f}N/{abs(end[1]):.2f}W"
-
-
-def generate(count: int = 10):
-    now = int(datetime.now(tz=timezone.utc).timestamp())
-    flights = []
-    for i in range(count):
-        flights.append(
-            {
-                "ACID": f"SIM{i:03d}",
-                "Plane type": random.choice(["jet", "turboprop", "prop"]),
-                "route": _rand_route(),
-                "altitude": random.choice([18000, 24000, 30000, 34000, 36000]),
-                "departure time": now + i * 120,
-                "aircraft speed": random.choice([260, 320, 420, 460]),
-                "passengers": random.choice([40, 90, 120, 180]),
-                "is_cargo": random.choice([False, False, True]),
-            }
+import time
+
+import numpy as np
+
+try:
+    import orjson
+
+    def _dumps(payload) -> str:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:  # pragma: no cover - depends on the environment
+    import json
+
+    def _dumps(payload) -> str:
+        return json.dumps(payload, indent=2)
+
+
+def _rand_routes(rng: np.random.Generator, count: int):
+    start_lat, mid_lat, end_lat = (base + rng.random(count) for base in (49.5, 49.0, 45.0))
+    # Longitudes are all west, so draw them as positive degrees W.
+    start_lon, mid_lon, end_lon = (base - rng.random(count) for base in (111.2, 95.0, 76.5))
+    return [
+        f"{slat:.2f}N/{slon:.2f}W {mlat:.2f}N/{mlon:.2f}W {elat:.2f}N/{elon:.2f}W"
+        for slat, slon, mlat, mlon, elat, elon in zip(
+            start_lat.tolist(), start_lon.tolist(), mid_lat.tolist(), mid_lon.tolist(), end_lat.tolist(), end_lon.tolist()
         )
-    return flights
+    ]
+
+
+def generate(count: int = 10, seed=None):
+    now = int(time.time())
+    # Draw each column in one call instead of one RNG call per field per flight.
+    rng = np.random.default_rng(seed)
+    routes = _rand_routes(rng, count)
+    plane_types = rng.choice(["jet", "turboprop", "prop"], count).tolist()
+    altitudes = rng.choice([18000, 24000, 30000, 34000, 36000], count).tolist()
+    speeds = rng.choice([260, 320, 420, 460], count).tolist()
+    passengers = rng.choice([40, 90, 120, 180], count).tolist()
+    is_cargo = rng.choice([False, False, True], count).tolist()
+
+    return [
+        {
+            "ACID": f"SIM{i:03d}",
+            "Plane type": plane_types[i],
+            "route": routes[i],
+            "altitude": altitudes[i],
+            "departure time": now + i * 120,
+            "aircraft speed": speeds[i],
+            "passengers": passengers[i],
+            "is_cargo": is_cargo[i],
+        }
+        for i in range(count)
+    ]
 
 
 if __name__ == "__main__":
-    print(json.dumps(generate(12), indent=2))
+    print(_dumps(generate(12)))